@@ -0,0 +1,126 @@
+/*
+ * enigma_core.c
+ * Optional C implementation of the Enigma scrambler used by main.py.
+ * Build in place with:  python setup.py build_ext --inplace
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+/* wiring/inv have the ring settings folded in (Rotor.folded_wiring in main.py) */
+typedef struct {
+    uint8_t wiring[3][26], inv[3][26], refl[26], plug[26];
+    uint8_t pos[3];
+    uint32_t notch_mask[3];
+} Machine;
+
+static inline uint8_t rotor_pass(const uint8_t *w, uint8_t c, uint8_t pos)
+{
+    /* all terms are 0..25, so adding 26 keeps the operand non-negative */
+    return (uint8_t)((w[(c + pos) % 26] + 26 - pos) % 26);
+}
+
+static inline int at_notch(const Machine *m, int r)
+{
+    return (m->notch_mask[r] >> m->pos[r]) & 1;
+}
+
+/* Letters 'A'..'Z' are scrambled, every other byte is copied unchanged.
+ * Rotor positions in m are advanced as the Python step_rotors would. */
+static void encrypt(Machine *m, const uint8_t *in, uint8_t *out, size_t n)
+{
+    for (size_t i = 0; i < n; i++) {
+        uint8_t b = in[i];
+        if (b < 'A' || b > 'Z') {
+            out[i] = b;
+            continue;
+        }
+        if (at_notch(m, 2) || at_notch(m, 1))
+            m->pos[1] = (m->pos[1] + 1) % 26;
+        if (at_notch(m, 1))
+            m->pos[0] = (m->pos[0] + 1) % 26;
+        m->pos[2] = (m->pos[2] + 1) % 26;
+
+        uint8_t c = m->plug[b - 'A'];
+        for (int r = 2; r >= 0; r--)
+            c = rotor_pass(m->wiring[r], c, m->pos[r]);
+        c = m->refl[c];
+        for (int r = 0; r < 3; r++)
+            c = rotor_pass(m->inv[r], c, m->pos[r]);
+        out[i] = (uint8_t)(m->plug[c] + 'A');
+    }
+}
+
+static int copy_table(uint8_t *dst, const char *src, Py_ssize_t len, Py_ssize_t want, const char *name)
+{
+    if (len != want) {
+        PyErr_Format(PyExc_ValueError, "%s must be %zd bytes, got %zd", name, want, len);
+        return -1;
+    }
+    for (Py_ssize_t i = 0; i < len; i++) {
+        if ((uint8_t)src[i] > 25) {
+            PyErr_Format(PyExc_ValueError, "%s values must be in 0..25", name);
+            return -1;
+        }
+    }
+    memcpy(dst, src, (size_t)len);
+    return 0;
+}
+
+static PyObject *py_encrypt(PyObject *self, PyObject *args)
+{
+    Py_buffer data;
+    const char *wiring, *inv, *refl, *plug, *pos;
+    Py_ssize_t wiring_len, inv_len, refl_len, plug_len, pos_len;
+    unsigned int notch[3];
+    Machine m;
+
+    if (!PyArg_ParseTuple(args, "y*y#y#y#y#y#(III):encrypt", &data,
+                          &wiring, &wiring_len, &inv, &inv_len, &refl, &refl_len,
+                          &plug, &plug_len, &pos, &pos_len,
+                          &notch[0], &notch[1], &notch[2]))
+        return NULL;
+
+    if (copy_table(&m.wiring[0][0], wiring, wiring_len, 78, "wiring") < 0 ||
+        copy_table(&m.inv[0][0], inv, inv_len, 78, "inverse wiring") < 0 ||
+        copy_table(m.refl, refl, refl_len, 26, "reflector") < 0 ||
+        copy_table(m.plug, plug, plug_len, 26, "plugboard") < 0 ||
+        copy_table(m.pos, pos, pos_len, 3, "positions") < 0) {
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+    for (int r = 0; r < 3; r++)
+        m.notch_mask[r] = notch[r];
+
+    PyObject *out = PyBytes_FromStringAndSize(NULL, data.len);
+    if (out == NULL) {
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+    Py_BEGIN_ALLOW_THREADS
+    encrypt(&m, (const uint8_t *)data.buf, (uint8_t *)PyBytes_AS_STRING(out), (size_t)data.len);
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&data);
+
+    return Py_BuildValue("(Ny#)", out, (const char *)m.pos, (Py_ssize_t)3);
+}
+
+static PyMethodDef enigma_core_methods[] = {
+    {"encrypt", py_encrypt, METH_VARARGS,
+     "encrypt(data, wiring, inverse, reflector, plugboard, positions, notch_masks)"
+     " -> (bytes, positions)\n\n"
+     "Scramble the ASCII letters A-Z in data; other bytes are copied unchanged."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef enigma_core_module = {
+    PyModuleDef_HEAD_INIT, "enigma_core", "C scrambler for the Enigma simulator.", -1,
+    enigma_core_methods
+};
+
+PyMODINIT_FUNC PyInit_enigma_core(void)
+{
+    return PyModule_Create(&enigma_core_module);
+}
@@ -8,9 +8,43 @@ and an import/export compact message format for sharing settings + ciphertext.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import functools
+import platform
+import re
 import string
 
+_IS_PYPY = platform.python_implementation() == 'PyPy'
+
+if _IS_PYPY:
+    # PyPy's JIT traces the pure-Python composite-table path well, while numpy and
+    # C extensions would go through its slow cpyext layer, so none of them are used
+    np = njit = enigma_core = None
+else:
+    try:
+        import numpy as np
+    except ImportError:  # numpy is optional; encrypt falls back to the pure-Python path
+        np = None
+
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional as well; without it the composite table is used
+        njit = None
+
+    try:
+        import enigma_core  # optional C extension, see setup.py
+    except ImportError:
+        enigma_core = None
+
 ALPHABET = string.ascii_uppercase
+# O(1) membership test for single characters
+_ALPHA_SET = frozenset(ALPHABET)
+# runs of letters; used with split() so the letter runs land on the odd indices
+_LETTER_RE = re.compile(r'([A-Z]+)')
+# separators between plugboard pairs ('-' is not one: it joins the letters of "A-T")
+_PLUG_SEP_RE = re.compile(r'[,;/\s]+')
+# bytes.translate tables between ASCII 'A'..'Z' and letter indices 0..25
+_ASCII_TO_INDEX = bytes((i - 65) % 256 for i in range(256))
+_INDEX_TO_ASCII = bytes((i + 65) % 256 for i in range(256))
 
 # Rotor wirings and notches for common historical rotors (mapped A->0 ... Z->25)
 ROTOR_SPECS = {
@@ -28,48 +62,154 @@ REFLECTORS = {
     # Add reflector C etc. if desired
 }
 
+# _MOD26[x + 26] == x % 26 for -26 <= x < 78: a bytes index instead of a modulo
+_MOD26 = bytes(i % 26 for i in range(-26, 78))
+
 def letter_to_index(c):
     return ord(c) - ord('A')
 
 def index_to_letter(i):
     return ALPHABET[i % 26]
 
+def _parse_rotor(wiring_str, notch_letters):
+    # -> (wiring, inverse wiring, notch bitmask); bit i set means a notch at letter i
+    # tables are bytes: 26 contiguous bytes instead of a list of boxed ints
+    wiring = bytes(letter_to_index(c) for c in wiring_str)
+    inverse = bytearray(26)
+    for i, w in enumerate(wiring):
+        inverse[w] = i
+    notch_mask = 0
+    for c in notch_letters:
+        notch_mask |= 1 << letter_to_index(c)  # |= so a repeated letter is harmless
+    return wiring, bytes(inverse), notch_mask
+
+# parsed once at import, keyed by the spec strings; anything else passed to Rotor or
+# Reflector (a custom wiring, a list of notch letters) is parsed on the spot
+_ROTOR_CACHE = {spec: _parse_rotor(*spec) for spec in ROTOR_SPECS.values()}
+_REFLECTOR_CACHE = {w: bytes(letter_to_index(c) for c in w) for w in REFLECTORS.values()}
+
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def _enigma_core(codes, wiring, inv_wiring, notches, pos, plug, refl):
+        # codes: letter indices 0..25. wiring/inv_wiring/notches are (3,26) left->right with
+        # the ring settings already folded in (Rotor.folded_wiring), pos is length-3 and is
+        # updated in place so the machine state carries over.
+        out = np.empty_like(codes)
+        pl, pm, pr = pos[0], pos[1], pos[2]
+        for i in range(codes.shape[0]):
+            # same double-step rule as EnigmaMachine.step_rotors
+            if notches[2, pr] or notches[1, pm]:
+                pm = (pm + 1) % 26
+            if notches[1, pm]:
+                pl = (pl + 1) % 26
+            pr = (pr + 1) % 26
+            c = plug[codes[i]]
+            c = (wiring[2, (c + pr) % 26] - pr) % 26
+            c = (wiring[1, (c + pm) % 26] - pm) % 26
+            c = (wiring[0, (c + pl) % 26] - pl) % 26
+            c = refl[c]
+            c = (inv_wiring[0, (c + pl) % 26] - pl) % 26
+            c = (inv_wiring[1, (c + pm) % 26] - pm) % 26
+            c = (inv_wiring[2, (c + pr) % 26] - pr) % 26
+            out[i] = plug[c]
+        pos[0], pos[1], pos[2] = pl, pm, pr
+        return out
+else:
+    _enigma_core = None
+
+def _scramble_letters(letters, composite, pl, pm, pr, notch_m, notch_r):
+    # Pure-Python scrambler loop: steps the rotors and looks up EnigmaMachine.composite
+    # for each (plugged) letter index. Everything is kept in locals; the final rotor
+    # positions are returned for the caller to store. -> (bytearray, pl, pm, pr)
+    mod26 = _MOD26  # (x + 1) % 26 == mod26[x + 27]
+    # write into a preallocated buffer rather than growing one per letter
+    out = bytearray(len(letters))
+    for i, c in enumerate(letters):
+        # same double-step rule as EnigmaMachine.step_rotors
+        if (notch_r >> pr) & 1 or (notch_m >> pm) & 1:
+            pm = mod26[pm + 27]
+        if (notch_m >> pm) & 1:
+            pl = mod26[pl + 27]
+        pr = mod26[pr + 27]
+        out[i] = composite[(pl*676 + pm*26 + pr)*26 + c]
+    return out, pl, pm, pr
+
+@functools.lru_cache(maxsize=16)
+def _composite_table(rotor_tables, reflector):
+    # rotor_tables: ((fwd, bwd), ...) per rotor left->right, from Rotor.position_tables.
+    # For each (pL, pM, pR) store the rotors+reflector+rotors mapping as 26 bytes
+    # at offset (pL*676 + pM*26 + pR)*26. The plugboard is applied separately.
+    (left_fwd, left_bwd), (mid_fwd, mid_bwd), (right_fwd, right_bwd) = rotor_tables
+    table = bytearray()
+    for pl in range(26):
+        lf, lb = left_fwd[pl], left_bwd[pl]
+        for pm in range(26):
+            mf, mb = mid_fwd[pm], mid_bwd[pm]
+            core = [mb[lb[reflector[lf[mf[c]]]]] for c in range(26)]
+            for pr in range(26):
+                rf, rb = right_fwd[pr], right_bwd[pr]
+                table += bytes(rb[core[rf[c]]] for c in range(26))
+    return bytes(table)
+
 class Rotor:
     def __init__(self, name, wiring_str, notch_letters, ring_setting=1, position='A'):
         self.name = name
-        self.wiring = [letter_to_index(c) for c in wiring_str]
-        # inverse wiring for backward pass
-        self.inverse_wiring = [0]*26
-        for i, w in enumerate(self.wiring):
-            self.inverse_wiring[w] = i
-        self.notches = set(letter_to_index(c) for c in notch_letters)
+        parsed = None
+        if isinstance(wiring_str, str) and isinstance(notch_letters, str):
+            parsed = _ROTOR_CACHE.get((wiring_str, notch_letters))
+        if parsed is None:
+            parsed = _parse_rotor(wiring_str, notch_letters)
+        # inverse wiring is for the backward pass
+        self.wiring, self.inverse_wiring, self.notch_mask = parsed
         # ring setting: 1..26 (1 means no offset). internally we store 0..25 offset
         self.ring = (ring_setting - 1) % 26
-        self.position = letter_to_index(position)
+        self.position = letter_to_index(position) % 26
+        self.build_tables()
+
+    def build_tables(self):
+        # Fold the ring offset into the wiring, so a pass at position p is simply
+        # (folded[(c + p) % 26] - p) % 26. Call again if ring changes.
+        ring = self.ring
+        folded = bytes((self.wiring[(i - ring) % 26] + ring) % 26 for i in range(26))
+        folded_inverse = bytearray(26)
+        for i, w in enumerate(folded):
+            folded_inverse[w] = i
+        self.folded_wiring, self.folded_inverse = folded, bytes(folded_inverse)
+        # per-position tables are only needed by the table-driven paths; see position_tables
+        self._position_tables = None
+
+    def position_tables(self):
+        # -> (fwd, bwd): the pass mapping for every window position, so a rotor pass is
+        # a plain table lookup. Built on first use; tuples so they can key the
+        # composite table cache.
+        if self._position_tables is None:
+            mod26 = _MOD26
+            folded, folded_inverse = self.folded_wiring, self.folded_inverse
+            fwd = tuple(bytes(mod26[folded[mod26[c + p + 26]] - p + 26] for c in range(26))
+                        for p in range(26))
+            bwd = tuple(bytes(mod26[folded_inverse[mod26[c + p + 26]] - p + 26] for c in range(26))
+                        for p in range(26))
+            self._position_tables = (fwd, bwd)
+        return self._position_tables
 
     def step(self):
-        self.position = (self.position + 1) % 26
+        self.position = _MOD26[self.position + 27]
 
     def at_notch(self):
         # notch is evaluated with current position (window letter)
-        return self.position in self.notches
+        return (self.notch_mask >> self.position) & 1
 
     def forward(self, c):  # c is 0..25 entering rotor right->left
-        # apply rotor considering ring and position
-        shifted = (c + self.position - self.ring) % 26
-        wired = self.wiring[shifted]
-        out = (wired - self.position + self.ring) % 26
-        return out
+        # ring and position offsets are already folded into the table
+        return self.position_tables()[0][self.position][c]
 
     def backward(self, c):  # c is 0..25 entering rotor left->right
-        shifted = (c + self.position - self.ring) % 26
-        wired = self.inverse_wiring[shifted]
-        out = (wired - self.position + self.ring) % 26
-        return out
+        return self.position_tables()[1][self.position][c]
 
 class Reflector:
     def __init__(self, wiring_str):
-        self.wiring = [letter_to_index(c) for c in wiring_str]
+        wiring = _REFLECTOR_CACHE.get(wiring_str) if isinstance(wiring_str, str) else None
+        self.wiring = wiring or bytes(letter_to_index(c) for c in wiring_str)
 
     def reflect(self, c):
         return self.wiring[c]
@@ -84,9 +224,20 @@ class Plugboard:
                 b = letter_to_index(p[1])
                 self.mapping[a] = b
                 self.mapping[b] = a
+        self.build_tables()
+
+    def build_tables(self):
+        # derive the lookup tables from mapping; call again if mapping changes
+        self.table = bytes(self.mapping)
+        # 256-entry table for bytes.translate; only letter indices 0..25 are swapped
+        self._translate_table = self.table + bytes(range(26, 256))
 
     def swap(self, c):
-        return self.mapping[c]
+        return self.table[c]
+
+    def translate_bytes(self, buf):
+        # swap a whole buffer of letter indices (0..25) in one C-level call
+        return bytes(buf).translate(self._translate_table)
 
 class EnigmaMachine:
     def __init__(self, rotor_names, rotor_positions, ring_settings, reflector_name, plug_pairs):
@@ -99,6 +250,25 @@ class EnigmaMachine:
             self.rotors.append(Rotor(name, wiring, notch, ring_setting=ring, position=pos))
         self.reflector = Reflector(REFLECTORS[reflector_name])
         self.plugboard = Plugboard(plug_pairs)
+        # scrambler table for every rotor position triple, built lazily on first use
+        self.composite = None
+        # position-independent arguments for enigma_core.encrypt, packed on first use
+        self._c_tables = None
+
+    def _build_composite(self):
+        # shared between machines with the same rotors, rings and reflector; neither the
+        # start positions nor the plugboard are part of the table
+        tables = tuple(r.position_tables() for r in self.rotors)
+        self.composite = _composite_table(tables, self.reflector.wiring)
+
+    def invalidate(self):
+        # call after changing a rotor's wiring or ring, the reflector wiring or the
+        # plugboard mapping in place, so every derived table is rebuilt
+        for rotor in self.rotors:
+            rotor.build_tables()
+        self.plugboard.build_tables()
+        self.composite = None
+        self._c_tables = None
 
     def step_rotors(self):
         # Implement classic Enigma stepping with double-step:
@@ -116,33 +286,141 @@ class EnigmaMachine:
         right.step()
 
     def process_character(self, ch):
-        if ch not in ALPHABET:
+        if ch not in _ALPHA_SET:
             return ch
+        if self.composite is None:
+            self._build_composite()
         self.step_rotors()
-        c = letter_to_index(ch)
-        # plugboard in
-        c = self.plugboard.swap(c)
-        # pass through rotors right->left
-        for rotor in reversed(self.rotors):
-            c = rotor.forward(c)
-        # reflector
-        c = self.reflector.reflect(c)
-        # back through rotors left->right
-        for rotor in self.rotors:
-            c = rotor.backward(c)
-        # plugboard out
-        c = self.plugboard.swap(c)
-        return index_to_letter(c)
+        plug = self.plugboard.table
+        # plugboard in (letter_to_index inlined)
+        c = plug[ord(ch) - 65]
+        # rotors right->left, reflector, rotors left->right in one lookup
+        left, middle, right = self.rotors
+        idx = (left.position*676 + middle.position*26 + right.position)*26 + c
+        # plugboard out; the result is already 0..25 so no wrap-around is needed
+        return ALPHABET[plug[self.composite[idx]]]
+
+    def _position_sequence(self, n):
+        # Composite row index (pL*676 + pM*26 + pR) for each of the next n letters, as a
+        # uint16 array; rotor positions are left as n calls to step_rotors would leave
+        # them. Stepping does not depend on the text, so the positions are periodic
+        # (period at most 26*25*26 = 16900): simulate until a state repeats, then tile
+        # the cycle for the rest of the message.
+        left, middle, right = self.rotors
+        pl, pm, pr = left.position, middle.position, right.position
+        notch_m, notch_r = middle.notch_mask, right.notch_mask
+        mod26 = _MOD26  # (x + 1) % 26 == mod26[x + 27]
+        seen = {}
+        seq = []
+        cycle_start = None
+        while len(seq) < n:
+            if (notch_r >> pr) & 1 or (notch_m >> pm) & 1:
+                pm = mod26[pm + 27]
+            if (notch_m >> pm) & 1:
+                pl = mod26[pl + 27]
+            pr = mod26[pr + 27]
+            idx = pl*676 + pm*26 + pr
+            if idx in seen:
+                cycle_start = seen[idx]
+                break
+            seen[idx] = len(seq)
+            seq.append(idx)
+        seq = np.array(seq, dtype=np.uint16)
+        if cycle_start is not None:
+            cycle = seq[cycle_start:]
+            missing = n - len(seq)
+            reps = -(-missing // len(cycle))
+            seq = np.concatenate([seq, np.tile(cycle, reps)[:missing]])
+        if n:
+            pl, rest = divmod(int(seq[-1]), 676)
+            pm, pr = divmod(rest, 26)
+            left.position, middle.position, right.position = pl, pm, pr
+        return seq
+
+    def _scramble_numba(self, letters):
+        wiring = np.frombuffer(b''.join(r.folded_wiring for r in self.rotors), dtype=np.uint8)
+        wiring = wiring.reshape(3, 26).astype(np.int64)
+        inv_wiring = np.frombuffer(b''.join(r.folded_inverse for r in self.rotors), dtype=np.uint8)
+        inv_wiring = inv_wiring.reshape(3, 26).astype(np.int64)
+        notches = np.array([[(r.notch_mask >> p) & 1 for p in range(26)] for r in self.rotors],
+                           dtype=np.bool_)
+        pos = np.array([r.position for r in self.rotors], dtype=np.int64)
+        plug = np.array(self.plugboard.mapping, dtype=np.int64)
+        refl = np.frombuffer(self.reflector.wiring, dtype=np.uint8).astype(np.int64)
+        out = _enigma_core(letters, wiring, inv_wiring, notches, pos, plug, refl)
+        for r, p in zip(self.rotors, pos):
+            r.position = int(p)
+        return out
+
+    def _scramble_composite(self, letters):
+        if self.composite is None:
+            self._build_composite()
+        rows = self._position_sequence(len(letters))
+        plug = np.array(self.plugboard.mapping, dtype=np.intp)
+        composite = np.frombuffer(self.composite, dtype=np.uint8).reshape(26**3, 26)
+        return plug[composite[rows, plug[letters]]]
+
+    def _scramble_numpy(self, letters):
+        codes = np.frombuffer(letters, dtype=np.uint8).astype(np.int64)
+        if _enigma_core is not None:
+            out = self._scramble_numba(codes)
+        else:
+            out = self._scramble_composite(codes)
+        return out.astype(np.uint8).tobytes()
+
+    def _encrypt_c(self, text):
+        if self._c_tables is None:
+            self._c_tables = (
+                b''.join(r.folded_wiring for r in self.rotors),
+                b''.join(r.folded_inverse for r in self.rotors),
+                self.reflector.wiring,
+                self.plugboard.table,
+            )
+        wiring, inv_wiring, refl, plug = self._c_tables
+        # letters only occur as single bytes in UTF-8, so the C loop can skip everything else
+        out, pos = enigma_core.encrypt(
+            text.upper().encode('utf-8', 'surrogatepass'), wiring, inv_wiring, refl, plug,
+            bytes(r.position for r in self.rotors),
+            tuple(r.notch_mask for r in self.rotors),
+        )
+        for r, p in zip(self.rotors, pos):
+            r.position = p
+        return out.decode('utf-8', 'surrogatepass')
 
     def encrypt(self, text):
-        result = []
-        for ch in text.upper():
-            if ch in ALPHABET:
-                result.append(self.process_character(ch))
-            else:
-                # keep spaces/punctuation as-is
-                result.append(ch)
-        return ''.join(result)
+        if enigma_core is not None:
+            return self._encrypt_c(text)
+        # scramble all letter runs in one go; spaces/punctuation (even indices) are kept as-is
+        parts = _LETTER_RE.split(text.upper())
+        letters = ''.join(parts[1::2]).encode('ascii').translate(_ASCII_TO_INDEX)
+        if np is not None:
+            scrambled = self._scramble_numpy(letters)
+        else:
+            scrambled = self._scramble_python(letters)
+        scrambled = scrambled.translate(_INDEX_TO_ASCII).decode('ascii')
+        offset = 0
+        for i in range(1, len(parts), 2):
+            end = offset + len(parts[i])
+            parts[i] = scrambled[offset:end]
+            offset = end
+        return ''.join(parts)
+
+    def _scramble_python(self, letters):
+        # letters: bytes of letter indices 0..25
+        if self.composite is None:
+            self._build_composite()
+        left, middle, right = self.rotors
+        # plugboard in/out are applied to the whole message at once
+        plugged = self.plugboard.translate_bytes(letters)
+        out, left.position, middle.position, right.position = _scramble_letters(
+            plugged, self.composite, left.position, middle.position, right.position,
+            middle.notch_mask, right.notch_mask)
+        return self.plugboard.translate_bytes(out)
+
+    def reset_positions(self, rotor_positions):
+        # rotor_positions: letters left-to-right, as passed to __init__
+        for rotor, pos in zip(self.rotors, rotor_positions):
+            rotor.position = letter_to_index(pos) % 26
 
     def get_settings_serialized(self):
         # Return compact settings string for embedding with ciphertext
@@ -170,7 +448,10 @@ class EnigmaMachine:
                 k, v = part.split(':', 1)
                 parts[k] = v
         rotor_names = parts.get('R', 'I,II,III').split(',')
-        positions = list(parts.get('POS', 'AAA'))
+        positions = list(parts.get('POS', 'AAA').upper())
+        # the machine reduces positions mod 26, which is only meaningful for letters
+        if not all(p in _ALPHA_SET for p in positions):
+            raise ValueError(f"rotor positions must be letters A..Z, got {parts['POS']!r}")
         rings = [int(x) for x in parts.get('RING', '01,01,01').split(',')]
         reflector = parts.get('REF', 'B')
         plugpairs = []
@@ -197,6 +478,8 @@ class EnigmaMachine:
         return cls(rotor_names, positions, rings, reflector, plugpairs)
 
 # ---------- GUI code using tkinter ----------
+TEXT_CHUNK_CHARS = 64000  # characters read from the input box per encrypt call
+
 class EnigmaGUI:
     def __init__(self, root):
         self.root = root
@@ -216,9 +499,18 @@ class EnigmaGUI:
         self.right_ring_var = tk.IntVar(value=1)
         self.reflector_var = tk.StringVar(value=self.reflectors[0])
         self.plugboard_var = tk.StringVar(value="")  # e.g. "AT BS CM"
+        # machines keyed by wiring settings; cleared whenever one of them is edited
+        self._machine_cache = {}
+        for var in (self.left_rotor_var, self.middle_rotor_var, self.right_rotor_var,
+                    self.left_ring_var, self.mid_ring_var, self.right_ring_var,
+                    self.reflector_var, self.plugboard_var):
+            var.trace_add('write', self._invalidate_machine_cache)
 
         self.create_widgets()
 
+    def _invalidate_machine_cache(self, *args):
+        self._machine_cache.clear()
+
     def create_widgets(self):
         frm = ttk.Frame(self.root, padding=8)
         frm.grid(row=0, column=0, sticky="nsew")
@@ -277,22 +569,13 @@ class EnigmaGUI:
 
     def parse_plug_pairs(self, txt):
         # Accept "AT BS CM" or "A-T,B-S" etc. Return list of 2-letter strings like ["AT","BS"]
-        txt = txt.strip().upper()
-        if not txt:
-            return []
-        # normalize separators
-        for sep in [',', ';', '/']:
-            txt = txt.replace(sep, ' ')
-        parts = [p.strip() for p in txt.split() if p.strip()]
-        pairs = []
-        for p in parts:
-            p = p.replace('-', '')
-            if len(p) == 2 and p[0] != p[1]:
-                pairs.append(p)
-        # remove duplicates/conflicts (simple approach)
+        # remove duplicates/conflicts (simple approach: first pair using a letter wins)
         used = set()
         clean = []
-        for p in pairs:
+        for p in _PLUG_SEP_RE.split(txt.upper()):
+            p = p.replace('-', '')
+            if len(p) != 2 or p[0] == p[1]:
+                continue
             a, b = p[0], p[1]
             if a in used or b in used:
                 continue
@@ -303,6 +586,9 @@ class EnigmaGUI:
     def build_machine_from_ui(self):
         rotor_names = [self.left_rotor_var.get(), self.middle_rotor_var.get(), self.right_rotor_var.get()]
         positions = [self.left_pos_var.get().upper()[:1] or 'A', self.mid_pos_var.get().upper()[:1] or 'A', self.right_pos_var.get().upper()[:1] or 'A']
+        if not all(p in _ALPHA_SET for p in positions):
+            messagebox.showerror("Error", "Rotor positions must be letters A..Z")
+            raise ValueError("rotor positions must be letters A..Z")
         try:
             rings = [int(self.left_ring_var.get()), int(self.mid_ring_var.get()), int(self.right_ring_var.get())]
         except Exception:
@@ -310,17 +596,37 @@ class EnigmaGUI:
             raise
         reflector = self.reflector_var.get()
         plugs = self.parse_plug_pairs(self.plugboard_var.get())
-        return EnigmaMachine(rotor_names, positions, rings, reflector, plugs)
+        # start positions are not part of the key: they are cheap to reset and
+        # do not affect the precomputed tables
+        key = (tuple(rotor_names), tuple(rings), reflector, tuple(plugs))
+        machine = self._machine_cache.get(key)
+        if machine is None:
+            machine = EnigmaMachine(rotor_names, positions, rings, reflector, plugs)
+            self._machine_cache[key] = machine
+        else:
+            # a cached machine has been advanced by its previous encrypt
+            machine.reset_positions(positions)
+        return machine
 
     def encrypt_action(self):
         try:
             machine = self.build_machine_from_ui()
         except Exception:
             return
-        input_text = self.input_text.get("1.0", tk.END).strip('\n')
-        out = machine.encrypt(input_text)
         self.output_text.delete("1.0", tk.END)
-        self.output_text.insert(tk.END, out)
+        # same range as get("1.0", END).strip('\n'): first to last non-newline character
+        start = self.input_text.search(r'[^\n]', "1.0", "end-1c", regexp=True)
+        if start:
+            last = self.input_text.search(r'[^\n]', "end-1c", "1.0", backwards=True, regexp=True)
+            end = self.input_text.index(f"{last}+1c")
+            # stream in chunks so a long paste is never copied out of Tk in one piece;
+            # the machine keeps its rotor positions from one chunk to the next
+            while self.input_text.compare(start, "<", end):
+                stop = self.input_text.index(f"{start}+{TEXT_CHUNK_CHARS}c")
+                if self.input_text.compare(stop, ">", end):
+                    stop = end
+                self.output_text.insert(tk.END, machine.encrypt(self.input_text.get(start, stop)))
+                start = stop
         self.status_var.set("Encrypted/Decrypted. Rotors advanced accordingly.")
 
     def clear_action(self):
@@ -412,14 +718,14 @@ class EnigmaGUI:
 
     def test_roundtrip(self):
         # Simple sanity test: encrypt then reset positions and decrypt
+        pt = "HELLO WORLD"
         try:
-            initial_machine = self.build_machine_from_ui()
+            machine_enc = self.build_machine_from_ui()
         except Exception:
             return
-        pt = "HELLO WORLD"
-        machine_enc = self.build_machine_from_ui()
         ct = machine_enc.encrypt(pt)
-        # To decrypt we must reset rotors to same starting positions: build new machine with same UI values (positions unchanged)
+        # To decrypt we must reset rotors to same starting positions: with unchanged settings this returns
+        # the same cached machine, and build_machine_from_ui resets it to the UI start positions
         machine_dec = self.build_machine_from_ui()
         # For a correct Enigma, encrypting ct with same start positions yields original plaintext (since machine is reciprocal)
         out = machine_dec.encrypt(ct)
@@ -0,0 +1,12 @@
+"""Builds the optional enigma_core C extension: python setup.py build_ext --inplace"""
+
+import sys
+from setuptools import setup, Extension
+
+extra_args = [] if sys.platform == 'win32' else ['-O3', '-march=native']
+
+setup(
+    name='virtual-enigma',
+    py_modules=['main'],
+    ext_modules=[Extension('enigma_core', ['enigma_core.c'], extra_compile_args=extra_args)],
+)
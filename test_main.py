@@ -0,0 +1,151 @@
+"""
+Checks every encrypt backend against an independent reference implementation.
+
+Each backend carries its own copy of the double-step logic, and normally only
+the fastest installed one runs, so every available backend is forced in turn.
+Run with:  python -m unittest test_main
+"""
+
+import random
+import unittest
+from unittest import mock
+
+import main
+
+# backend name -> module attributes to disable so encrypt falls through to it
+BACKENDS = {
+    'c': {},
+    'numba': {'enigma_core': None},
+    'numpy': {'enigma_core': None, '_enigma_core': None},
+    'python': {'enigma_core': None, '_enigma_core': None, 'np': None},
+}
+
+def backend_available(name):
+    return {
+        'c': main.enigma_core is not None,
+        'numba': main._enigma_core is not None,
+        'numpy': main.np is not None,
+        'python': True,
+    }[name]
+
+def random_settings(rng):
+    names = rng.sample(list(main.ROTOR_SPECS), 3)
+    positions = [rng.choice(main.ALPHABET) for _ in range(3)]
+    rings = [rng.randint(1, 26) for _ in range(3)]
+    letters = rng.sample(main.ALPHABET, 2*rng.randint(0, 10))
+    plugs = [letters[i] + letters[i+1] for i in range(0, len(letters), 2)]
+    return names, positions, rings, 'B', plugs
+
+def reference(settings, text):
+    # The original per-rotor modular formula, built straight from ROTOR_SPECS so it
+    # shares none of the folded/precomputed tables the backends use.
+    # -> (output text, final rotor positions)
+    names, positions, rings, reflector, plugs = settings
+    wirings = [[ord(c) - 65 for c in main.ROTOR_SPECS[name][0]] for name in names]
+    inverses = []
+    for wiring in wirings:
+        inverse = [0]*26
+        for i, w in enumerate(wiring):
+            inverse[w] = i
+        inverses.append(inverse)
+    notches = [{ord(c) - 65 for c in main.ROTOR_SPECS[name][1]} for name in names]
+    offsets = [ring - 1 for ring in rings]
+    pos = [ord(p) - 65 for p in positions]
+    refl = [ord(c) - 65 for c in main.REFLECTORS[reflector]]
+    plug = list(range(26))
+    for a, b in plugs:
+        plug[ord(a) - 65], plug[ord(b) - 65] = ord(b) - 65, ord(a) - 65
+
+    def rotor_pass(table, r, c):
+        return (table[(c + pos[r] - offsets[r]) % 26] - pos[r] + offsets[r]) % 26
+
+    out = []
+    for ch in text.upper():
+        if not 'A' <= ch <= 'Z':
+            out.append(ch)
+            continue
+        if pos[2] in notches[2] or pos[1] in notches[1]:
+            pos[1] = (pos[1] + 1) % 26
+        if pos[1] in notches[1]:
+            pos[0] = (pos[0] + 1) % 26
+        pos[2] = (pos[2] + 1) % 26
+        c = plug[ord(ch) - 65]
+        for r in (2, 1, 0):
+            c = rotor_pass(wirings[r], r, c)
+        c = refl[c]
+        for r in (0, 1, 2):
+            c = rotor_pass(inverses[r], r, c)
+        out.append(chr(plug[c] + 65))
+    return ''.join(out), pos
+
+# (settings, plaintext, ciphertext); the third is the opening of the 1941
+# "Operation Barbarossa" message, the others were produced by the original script
+KNOWN_VECTORS = [
+    ((["I", "II", "III"], "AAA", [1, 1, 1], 'B', []), "HELLO WORLD", "ILBDA AMTAZ"),
+    ((["I", "II", "III"], "AAA", [2, 2, 2], 'B', []), "AAAAA", "EWTYX"),
+    ((["II", "IV", "V"], "BLA", [2, 21, 12], 'B',
+      ["AV", "BS", "CG", "DL", "FU", "HZ", "IN", "KM", "OW", "RX"]),
+     "EDPUD NRGYS ZRCXN UYTPO MRMBO", "AUFKL XABTE ILUNG XVONX KURTI"),
+    ((["V", "III", "I"], "QEV", [5, 17, 26], 'B', ["AT", "BS", "CM"]),
+     "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG", "DDV BHUGT FXDMW OYD RHDAZ BRYX LQB PFMK YMV"),
+    ((["IV", "I", "II"], "ZDQ", [13, 1, 8], 'B', ["QW", "ER"]), "A"*60,
+     "MTKMUZOGGDDGLUSIUUEJTTFMXJNJYNCIGPSDYRQVHIZEIOYJPGEYDPDYYUEC"),
+]
+
+class BackendTest(unittest.TestCase):
+    def check_backend(self, name):
+        if not backend_available(name):
+            self.skipTest(f"{name} backend not available")
+        rng = random.Random(1)
+        alphabet = main.ALPHABET + "  .,!\nabcé\U0001F600\ud800"
+        for _ in range(20):
+            settings = random_settings(rng)
+            # long enough for the position sequence to wrap its 16900-step cycle
+            n = rng.choice([0, 1, 11, 500, 20000])
+            text = ''.join(rng.choice(alphabet) for _ in range(n))
+            expected, positions = reference(settings, text)
+            with mock.patch.dict(main.__dict__, BACKENDS[name]):
+                machine = main.EnigmaMachine(*settings)
+                # two calls, so rotor state must carry over between them
+                out = machine.encrypt(text[:n//2]) + machine.encrypt(text[n//2:])
+            self.assertEqual(out, expected, settings)
+            self.assertEqual([r.position for r in machine.rotors], positions, settings)
+        for settings, plain, cipher in KNOWN_VECTORS:
+            with mock.patch.dict(main.__dict__, BACKENDS[name]):
+                self.assertEqual(main.EnigmaMachine(*settings).encrypt(plain), cipher, settings)
+
+    def test_c(self):
+        self.check_backend('c')
+
+    def test_numba(self):
+        self.check_backend('numba')
+
+    def test_numpy(self):
+        self.check_backend('numpy')
+
+    def test_python(self):
+        self.check_backend('python')
+
+    def test_reference(self):
+        for settings, plain, cipher in KNOWN_VECTORS:
+            self.assertEqual(reference(settings, plain)[0], cipher, settings)
+
+class SpecTest(unittest.TestCase):
+    def test_custom_rotor_and_reflector(self):
+        # non-str specs bypass the module-level caches
+        rotor = main.Rotor('VI', 'JPGVOUMFYQBENHZRDKASXLICTW', ['Z', 'M'])
+        self.assertEqual(rotor.notch_mask, (1 << 25) | (1 << 12))
+        self.assertEqual(rotor.wiring, main.Rotor('VI', 'JPGVOUMFYQBENHZRDKASXLICTW', 'ZM').wiring)
+        # a repeated notch letter counts once, as it did with the old notch set
+        self.assertEqual(main.Rotor('I', main.ROTOR_SPECS['I'][0], 'QQ').notch_mask, 1 << 16)
+        reflector = main.Reflector(list(main.REFLECTORS['B']))
+        self.assertEqual(reflector.wiring, main.Reflector(main.REFLECTORS['B']).wiring)
+
+    def test_serialized_positions(self):
+        machine = main.EnigmaMachine.from_serialized("R:I,II,III;POS:abc;RING:01,01,01;REF:B;PLUG:")
+        self.assertEqual([r.position for r in machine.rotors], [0, 1, 2])
+        with self.assertRaises(ValueError):
+            main.EnigmaMachine.from_serialized("R:I,II,III;POS:A0C;RING:01,01,01;REF:B;PLUG:")
+
+if __name__ == "__main__":
+    unittest.main()